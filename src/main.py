@@ -1,62 +1,230 @@
+import heapq
 import math
-from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor
-
-def round_to_infinity(x, d=1):
-    factor = 10 ** d
-    # For non-negative values, round up; for negatives, truncate (per provided behavior)
-    return (math.ceil if x >= 0 else math.trunc)(x * factor) / factor
-
-def process_chunk(lines):
-    # Create a local dict: city -> [min, max, total, count]
-    local = defaultdict(lambda: [float('inf'), float('-inf'), 0.0, 0])
-    for line in lines:
-        parts = line.split(';')
-        if len(parts) != 2:
-            continue
-        city, score = parts[0].strip(), parts[1].strip()
+import multiprocessing
+import os
+import sys
+from array import array
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from operator import itemgetter
+
+# Largest byte range one task reads, which bounds per-worker memory
+MAX_CHUNK_BYTES = 32 << 20
+
+# Split points are rounded up to a multiple of this before finding the next newline
+RANGE_ALIGN = 64 << 10
+
+# Bytes pread at a time while looking for the newline that ends a range
+BOUNDARY_PROBE = 64 << 10
+
+def next_line_start(fd, pos, size):
+    # Offset just past the first newline at or after pos, or size if there is none
+    while pos < size:
+        block = os.pread(fd, BOUNDARY_PROBE, pos)
+        if not block:
+            break
+        nl = block.find(b'\n')
+        if nl >= 0:
+            return pos + nl + 1
+        pos += len(block)
+    return size
+
+def chunk_boundaries(fd, size, num_chunks):
+    # Split the file into roughly equal byte ranges, each ending just past a newline
+    bounds = []
+    start = 0
+    for i in range(1, num_chunks + 1):
+        if start >= size:
+            break
+        if i == num_chunks:
+            end = size
+        else:
+            target = -(-(i * size // num_chunks) // RANGE_ALIGN) * RANGE_ALIGN
+            if target <= start:
+                # Rounded onto the previous split; skip rather than cut a one-line range
+                continue
+            end = next_line_start(fd, target, size)
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+# Every "-?\d+\.\d" score in range, mapped to its value in integer tenths
+SCORE_TENTHS = {f"{i / 10:.1f}".encode(): i for i in range(-9999, 10000)}
+SCORE_TENTHS[b"-0.0"] = 0
+
+# Bound on any value's tenths, so min and max fit in array("q")
+MAX_TENTHS = 1 << 63
+
+def reduce_scores(raw):
+    # min, max, sum and count of one city's scores in tenths, or None if none are valid
+    try:
+        scores = list(map(SCORE_TENTHS.__getitem__, raw))
+    except KeyError:
+        pass
+    else:
+        return (min(scores), max(scores), sum(scores), len(scores)) if scores else None
+    # Off-format values go through float(); min and max round up, the sum stays unrounded
+    scores = []
+    for value in raw:
         try:
-            s = float(score)
-        except ValueError:
+            score = float(value)
+        except (ValueError, OverflowError):
             continue
-        stats = local[city]
-        stats[0] = s if s < stats[0] else stats[0]
-        stats[1] = s if s > stats[1] else stats[1]
-        stats[2] += s
-        stats[3] += 1
-    return local
-
-def merge_dicts(dicts):
-    merged = defaultdict(lambda: [float('inf'), float('-inf'), 0.0, 0])
-    for d in dicts:
-        for city, stats in d.items():
-            mstats = merged[city]
-            mstats[0] = stats[0] if stats[0] < mstats[0] else mstats[0]
-            mstats[1] = stats[1] if stats[1] > mstats[1] else mstats[1]
-            mstats[2] += stats[2]
-            mstats[3] += stats[3]
-    return merged
+        # Drops nan, inf and values whose tenths do not fit the int64 columns
+        if abs(score) * 10 < MAX_TENTHS:
+            scores.append(score)
+    if not scores:
+        return None
+    return (math.ceil(min(scores) * 10), math.ceil(max(scores) * 10), sum(scores) * 10,
+            len(scores))
+
+# PyPy's JIT runs the plain per-line loop faster than the C-driven split
+PURE_PYTHON_KERNEL = sys.implementation.name == "pypy"
+
+# Every byte value except ';' and '\n', for translate() to delete
+NOT_SEPARATORS = bytes(b for b in range(256) if b not in b";\n")
+
+def well_formed(chunk):
+    # True if every line has exactly one ';', i.e. the separators read ";\n;\n..."
+    seps = chunk.translate(None, NOT_SEPARATORS)
+    pairs, tail = divmod(len(seps), 2)
+    return seps == b";\n" * pairs + b";" * tail
+
+# posix_fadvise is missing on some platforms (macOS)
+HAVE_FADVISE = hasattr(os, "posix_fadvise")
+
+# Descriptor main() opens before forking the worker pool; forked workers inherit it
+input_fd = None
+
+def process_chunk(path, start, end):
+    # Read just this range; pread leaves the shared descriptor's offset alone
+    fd = input_fd if input_fd is not None else os.open(path, os.O_RDONLY)
+    try:
+        if HAVE_FADVISE:
+            # Let the kernel start aggressive readahead on the whole range before the read
+            os.posix_fadvise(fd, start, end - start, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(fd, start, end - start, os.POSIX_FADV_WILLNEED)
+        chunk = os.pread(fd, end - start, start)
+    finally:
+        if fd != input_fd:
+            os.close(fd)
+    # Drop CRLF '\r's so those scores still match SCORE_TENTHS.
+    if b'\r' in chunk:
+        chunk = chunk.replace(b'\r\n', b'\n')
+    if not PURE_PYTHON_KERNEL and well_formed(chunk):
+        # Split into alternating city/score fields and group them entirely in C
+        groups = defaultdict(list)
+        chunk = chunk.replace(b';', b'\n')
+        fields = iter(chunk.split(b'\n'))
+        del chunk
+        deque(map(list.append, map(groups.__getitem__, fields), fields), maxlen=0)
+    else:
+        # Malformed chunks on CPython, and every chunk on PyPy
+        lines = chunk.split(b'\n')
+        del chunk
+        # One get per line; a new city's list starts with its first score
+        groups = {}
+        get_scores = groups.get
+        for line in lines:
+            # Skip lines without ';', blank ones included
+            sep = line.find(b';')
+            if sep < 0:
+                continue
+            city = line[:sep]
+            scores = get_scores(city)
+            if scores is None:
+                groups[city] = [line[sep + 1:]]
+            else:
+                scores.append(line[sep + 1:])
+    # Reduce one city at a time, in sorted order for the parent's merge
+    names, mins, maxs, sums, counts = [], [], [], [], []
+    for city, raw in sorted(groups.items(), key=itemgetter(0)):
+        stats = reduce_scores(raw)
+        if stats is None:
+            # Every score for this city was malformed
+            continue
+        names.append(city)
+        mins.append(stats[0])
+        maxs.append(stats[1])
+        sums.append(stats[2])
+        counts.append(stats[3])
+    # Arrays pickle as flat buffers rather than lists of number objects
+    return names, array("q", mins), array("q", maxs), array("d", sums), array("q", counts)
+
+def format_tenths(tenths):
+    # Integer tenths straight to "-?D.D" text, with no float or %.1f round trip
+    whole, frac = divmod(abs(tenths), 10)
+    return b"%b%d.%d" % (b"-" if tenths < 0 else b"", whole, frac)
+
+def merge_results(results):
+    # Columns are sorted by city, so one k-way merge puts each city's rows together
+    names, mins, maxs, sums, counts = [], [], [], [], []
+    last = None
+    for city, mn, mx, sm, cn in heapq.merge(*(zip(*result) for result in results)):
+        if city != last:
+            names.append(city)
+            mins.append(mn)
+            maxs.append(mx)
+            sums.append(sm)
+            counts.append(cn)
+            last = city
+            continue
+        if mn < mins[-1]:
+            mins[-1] = mn
+        if mx > maxs[-1]:
+            maxs[-1] = mx
+        sums[-1] += sm
+        counts[-1] += cn
+    return names, mins, maxs, sums, counts
+
+def available_cpus():
+    # CPUs this process may run on; PYTHON_CPU_COUNT overrides it
+    override = os.environ.get("PYTHON_CPU_COUNT", "")
+    if override.isdigit() and int(override) > 0:
+        return int(override)
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
 
 def main(input_file_name="testcase.txt", output_file_name="output.txt"):
-    with open(input_file_name, "r") as f:
-        lines = f.read().splitlines()
-
-    # Use up to 8 threads (or fewer if there are fewer lines)
-    num_threads = min(8, len(lines))
-    # Create chunks (each chunk gets roughly equal number of lines)
-    chunk_size = (len(lines) + num_threads - 1) // num_threads
-    chunks = [lines[i*chunk_size:(i+1)*chunk_size] for i in range(num_threads)]
-    
-    with ThreadPoolExecutor(max_workers=num_threads) as executor:
-        results = list(executor.map(process_chunk, chunks))
-    
-    final_data = merge_dicts(results)
-    
-    with open(output_file_name, "w") as f:
-        for city in sorted(final_data):
-            mini, maxi, total, count = final_data[city]
-            avg = round_to_infinity(total / count)
-            f.write(f"{city}={round_to_infinity(mini):.1f}/{avg:.1f}/{round_to_infinity(maxi):.1f}\n")
+    # One worker process per available CPU; the parse loop never releases the GIL
+    global input_fd
+    num_workers = available_cpus()
+    with open(input_file_name, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            bounds = []
+        else:
+            # Several ranges per worker, each at most MAX_CHUNK_BYTES
+            num_chunks = max(4 * num_workers, -(-size // MAX_CHUNK_BYTES))
+            bounds = chunk_boundaries(f.fileno(), size, num_chunks)
+
+        # Forked workers pread their (start, end) range from this descriptor
+        input_fd = f.fileno()
+        fork = multiprocessing.get_context("fork")
+        try:
+            with ProcessPoolExecutor(max_workers=max(1, min(num_workers, len(bounds))),
+                                     mp_context=fork) as executor:
+                starts = [start for start, _ in bounds]
+                ends = [end for _, end in bounds]
+                # One range per work item keeps the workers evenly loaded
+                results = list(executor.map(partial(process_chunk, input_file_name), starts, ends))
+        finally:
+            input_fd = None
+
+    names, mins, maxs, sums, counts = merge_results(results)
+
+    # Mean in tenths, rounded towards +infinity by ceiling division
+    means = [int(-(-total // count)) for total, count in zip(sums, counts)]
+
+    # Format every line as bytes and write the file once
+    lines = []
+    append = lines.append
+    for city, mn, mean, mx in zip(names, mins, means, maxs):
+        append(b"%b=%b/%b/%b\n" % (city, format_tenths(mn), format_tenths(mean), format_tenths(mx)))
+    with open(output_file_name, "wb") as f:
+        f.write(b"".join(lines))
 
 if __name__ == "__main__":
     main()